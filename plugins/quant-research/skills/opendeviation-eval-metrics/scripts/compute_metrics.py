@@ -4,27 +4,40 @@
 Usage:
     python compute_metrics.py --predictions preds.npy --actuals actuals.npy --timestamps ts.npy
     python compute_metrics.py --results folds.jsonl --aggregate
+    python compute_metrics.py --fold-dirs folds/fold_* --jobs 8 --aggregate
 
 Reference: quant-research:rangebar-eval-metrics skill
 
 Dependencies:
     numpy>=1.24.0
-    pandas>=2.0.0
     scipy>=1.10.0
+    orjson (optional, faster .jsonl parsing in aggregate mode)
 """
 
 from __future__ import annotations
 
 import argparse
+import contextlib
+import functools
+import itertools
 import json
 import logging
 import sys
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 import numpy as np
-import pandas as pd
 from scipy import stats
-from scipy.stats import norm, spearmanr
+from scipy.stats import norm, rankdata
+
+try:
+    import orjson
+
+    _HAS_ORJSON = True
+except ImportError:
+    _HAS_ORJSON = False
 
 logger = logging.getLogger(__name__)
 
@@ -34,11 +47,84 @@ logger = logging.getLogger(__name__)
 # =============================================================================
 
 
+def _to_utc_days(timestamps: np.ndarray) -> np.ndarray:
+    """UTC calendar day of each timestamp as int64 days since the epoch.
+
+    Accepts datetime64 arrays of any unit (naive values are UTC) or integer
+    epoch nanoseconds, matching ``pd.to_datetime(timestamps, utc=True)``.
+    NaT maps to the int64 minimum.
+    """
+    ts = np.asarray(timestamps)
+    if ts.dtype.kind in "iuf":
+        ts = ts.astype(np.int64).astype("datetime64[ns]")
+    elif ts.dtype.kind != "M":
+        ts = ts.astype("datetime64[ns]")
+    return ts.astype("datetime64[D]").view(np.int64)
+
+
+def _sum_by_utc_day(pnl: np.ndarray, days: np.ndarray) -> np.ndarray:
+    """Sum pnl per distinct day, in ascending day order.
+
+    Matches ``groupby(date).sum()``: NaT bars are dropped and NaN PnL is
+    skipped (an all-NaN day sums to 0), while +/-inf propagates.
+    """
+    missing = np.isnan(pnl)
+    if missing.any():
+        pnl = np.where(missing, 0.0, pnl)
+    nat = days == np.iinfo(np.int64).min
+    if nat.any():
+        pnl, days = pnl[~nat], days[~nat]
+    if len(days) == 0:
+        return np.zeros(0)
+
+    if np.all(days[1:] >= days[:-1]):
+        # Bars are time-ordered (the usual case): contiguous segment sums
+        starts = np.flatnonzero(np.diff(days)) + 1
+        return np.add.reduceat(pnl, np.concatenate(([0], starts)))
+
+    _, day_index = np.unique(days, return_inverse=True)
+    return np.bincount(day_index, weights=pnl)
+
+
+# Daily series shared by every metric of the evaluation in progress (per thread).
+_daily_scope = threading.local()
+
+
+@contextlib.contextmanager
+def _shared_daily_pnl(pnl: np.ndarray, timestamps: np.ndarray):
+    """Aggregate (pnl, timestamps) once and reuse it for the duration of the block.
+
+    evaluate_fold needs the same daily series for every daily metric. Scoping
+    the reuse to one evaluation (rather than a process-wide cache) means
+    callers of the public compute_* functions always get a fresh aggregation,
+    even if they mutate their arrays in place between calls.
+    """
+    daily_pnl = _aggregate_daily(pnl, timestamps)
+    previous = getattr(_daily_scope, "entry", None)
+    _daily_scope.entry = (pnl, timestamps, daily_pnl)
+    try:
+        yield daily_pnl
+    finally:
+        _daily_scope.entry = previous
+
+
+def _aggregate_daily(pnl: np.ndarray, timestamps: np.ndarray) -> np.ndarray:
+    daily_pnl = _sum_by_utc_day(np.asarray(pnl, dtype=np.float64), _to_utc_days(timestamps))
+    daily_pnl.flags.writeable = False
+    return daily_pnl
+
+
 def _group_by_day(pnl: np.ndarray, timestamps: np.ndarray) -> np.ndarray:
-    """Aggregate bar-level PnL to daily."""
-    df = pd.DataFrame({"pnl": pnl, "ts": pd.to_datetime(timestamps, utc=True)})
-    df["date"] = df["ts"].dt.date
-    return df.groupby("date")["pnl"].sum().values
+    """Aggregate bar-level PnL to daily.
+
+    Inside ``_shared_daily_pnl`` the series already aggregated for the same
+    (pnl, timestamps) objects is returned. The result is read-only because
+    it may be shared between metrics.
+    """
+    entry = getattr(_daily_scope, "entry", None)
+    if entry is not None and entry[0] is pnl and entry[1] is timestamps:
+        return entry[2]
+    return _aggregate_daily(pnl, timestamps)
 
 
 # =============================================================================
@@ -60,8 +146,26 @@ def compute_weekly_sharpe(
 
 
 def compute_hit_rate(predictions: np.ndarray, actuals: np.ndarray) -> float:
-    """Directional accuracy."""
-    return float(np.mean(np.sign(predictions) == np.sign(actuals)))
+    """Directional accuracy.
+
+    Compares IEEE-754 sign bits directly (XOR of the integer views is
+    non-negative when the sign bits agree) instead of materializing two
+    ``np.sign`` arrays. Zeros are masked so a zero only matches another zero,
+    and NaN never agrees, preserving ``np.sign(predictions) == np.sign(actuals)``
+    semantics.
+    """
+    predictions = np.asarray(predictions)
+    actuals = np.asarray(actuals)
+    if predictions.dtype != actuals.dtype or predictions.dtype.kind != "f":
+        predictions = predictions.astype(np.float64)
+        actuals = actuals.astype(np.float64)
+    int_view = np.dtype(f"i{predictions.dtype.itemsize}")
+
+    same_sign = (predictions.view(int_view) ^ actuals.view(int_view)) >= 0
+    pred_zero = predictions == 0
+    agree = (same_sign | pred_zero) & (pred_zero == (actuals == 0))
+    agree &= (predictions == predictions) & (actuals == actuals)  # NaN != NaN
+    return float(np.mean(agree))
 
 
 def compute_cumulative_pnl(pnl: np.ndarray) -> float:
@@ -106,19 +210,33 @@ def compute_profit_factor(
     if len(daily_pnl) < min_days:
         return float("nan")
 
-    gains = daily_pnl[daily_pnl > 0].sum()
-    losses = abs(daily_pnl[daily_pnl < 0].sum())
+    # Clip instead of boolean-mask indexing: no mask or filtered copies
+    gains = np.maximum(daily_pnl, 0.0).sum()
+    losses = -np.minimum(daily_pnl, 0.0).sum()
     if losses < 1e-10:
         return float("inf") if gains > 0 else 1.0
     return float(gains / losses)
 
 
+def _pearson(x: np.ndarray, y: np.ndarray) -> float:
+    """Pearson correlation of two equal-length 1-D arrays (NaN if either is constant)."""
+    dx = x - np.mean(x)
+    dy = y - np.mean(y)
+    denom = np.sqrt(np.dot(dx, dx) * np.dot(dy, dy))
+    if not denom > 0:
+        return float("nan")
+    return float(np.clip(np.dot(dx, dy) / denom, -1.0, 1.0))
+
+
 def compute_ic(predictions: np.ndarray, actuals: np.ndarray) -> float:
-    """Spearman rank IC."""
+    """Spearman rank IC.
+
+    Pearson correlation of average ranks (identical to ``spearmanr`` including
+    ties) without computing the unused p-value.
+    """
     if len(predictions) < 10:
         return float("nan")
-    ic, _ = spearmanr(predictions, actuals)
-    return float(ic)
+    return _pearson(rankdata(predictions), rankdata(actuals))
 
 
 def compute_prediction_autocorr(predictions: np.ndarray, lag: int = 1) -> float:
@@ -144,7 +262,7 @@ def compute_prediction_autocorr(predictions: np.ndarray, lag: int = 1) -> float:
     if np.std(predictions) < 1e-10:
         return 1.0  # Constant predictions have perfect autocorrelation
 
-    return float(np.corrcoef(predictions[:-lag], predictions[lag:])[0, 1])
+    return _pearson(predictions[:-lag], predictions[lag:])
 
 
 def detect_model_collapse(
@@ -160,7 +278,7 @@ def detect_model_collapse(
     Source: Multi-agent audit finding (model-expert subagent)
     """
     pred_std = np.std(predictions)
-    is_collapsed = pred_std < threshold
+    is_collapsed = bool(pred_std < threshold)
 
     if is_collapsed:
         logger.warning(
@@ -181,6 +299,25 @@ def detect_model_collapse(
 # =============================================================================
 
 
+def _moments(x: np.ndarray) -> tuple[float, float, float, float]:
+    """Mean, population variance, skewness and (non-excess) kurtosis.
+
+    Direct central-moment formula, equivalent to ``scipy.stats.skew`` and
+    ``scipy.stats.kurtosis(fisher=False)`` with ``bias=True`` but without the
+    SciPy dispatch overhead. Skewness and kurtosis are NaN for (numerically)
+    constant input, as in SciPy.
+    """
+    mean = float(np.mean(x))
+    d = x - mean
+    d2 = d * d
+    m2 = float(np.mean(d2))
+    if m2 <= (np.finfo(np.float64).eps * mean) ** 2:
+        return mean, m2, float("nan"), float("nan")
+    m3 = float(np.mean(d2 * d))
+    m4 = float(np.mean(d2 * d2))
+    return mean, m2, m3 / m2**1.5, m4 / m2**2
+
+
 def compute_sharpe_se(
     sharpe: float, n: int, skewness: float, kurtosis: float
 ) -> float:
@@ -201,17 +338,28 @@ def compute_psr(sharpe: float, se: float, benchmark: float = 0.0) -> float:
     return float(norm.cdf((sharpe - benchmark) / se))
 
 
+EULER_MASCHERONI = 0.5772156649
+
+
+@functools.lru_cache(maxsize=256)
+def _dsr_sr_expected_coeff(n_trials: int) -> float:
+    """Expected max Sharpe of n_trials null strategies, in units of SE.
+
+    Memoized: n_trials is typically constant across a sweep, so the two
+    ``norm.ppf`` evaluations only run once per distinct value.
+    """
+    if n_trials == 1:
+        return 0.0
+    q1 = norm.ppf(1.0 - 1.0 / n_trials)
+    q2 = norm.ppf(1.0 - 1.0 / (n_trials * np.e))
+    return float((1 - EULER_MASCHERONI) * q1 + EULER_MASCHERONI * q2)
+
+
 def compute_dsr(sharpe: float, se: float, n_trials: int) -> float:
     """Deflated Sharpe Ratio."""
     if n_trials < 1 or se <= 1e-10:
         return float("nan")
-    gamma = 0.5772156649
-    if n_trials == 1:
-        sr_expected = 0.0
-    else:
-        q1 = norm.ppf(1.0 - 1.0 / n_trials)
-        q2 = norm.ppf(1.0 - 1.0 / (n_trials * np.e))
-        sr_expected = se * ((1 - gamma) * q1 + gamma * q2)
+    sr_expected = se * _dsr_sr_expected_coeff(n_trials)
     return float(norm.cdf((sharpe - sr_expected) / se))
 
 
@@ -234,6 +382,11 @@ def compute_var_cvar(
 
     Returns:
         (VaR, CVaR) tuple - both are negative values representing loss
+
+    VaR equals ``np.percentile(daily_pnl, 100 * (1 - confidence))`` (linear
+    interpolation) up to float rounding. CVaR is the mean of every day
+    ``<= VaR``; days tied at the VaR level, including a quantile landing
+    exactly on a sample, are always in the tail.
     """
     daily_pnl = _group_by_day(pnl, timestamps)
 
@@ -241,10 +394,21 @@ def compute_var_cvar(
         return float("nan"), float("nan")
 
     alpha = 1 - confidence
-    var = float(np.percentile(daily_pnl, alpha * 100))
 
-    tail = daily_pnl[daily_pnl <= var]
-    cvar = float(np.mean(tail)) if len(tail) > 0 else var
+    # Linear-interpolated percentile (np.percentile default) via partial sort:
+    # O(n) selection of the two order statistics around the quantile.
+    # Rounding h keeps quantiles that land exactly on a sample (e.g. 5% of
+    # 101 days) from drifting off it through the float error in 1 - confidence.
+    h = round((len(daily_pnl) - 1) * alpha, 9)
+    lo = int(h)
+    hi = min(lo + 1, len(daily_pnl) - 1)
+    part = np.partition(daily_pnl, (lo, hi))
+    var = float(part[lo] + (h - lo) * (part[hi] - part[lo]))
+
+    # Everything up to `lo` is <= var; only ties at the VaR level can extend
+    # the tail past it, in which case fall back to the full mask.
+    tail = part[: lo + 1] if part[hi] > var else part[part <= var]
+    cvar = float(np.mean(tail))
 
     return var, cvar
 
@@ -271,8 +435,8 @@ def compute_omega(
         return float("nan")
 
     excess = daily_pnl - threshold
-    gains = excess[excess > 0].sum()
-    losses = (-excess[excess < 0]).sum()
+    gains = np.maximum(excess, 0.0).sum()
+    losses = -np.minimum(excess, 0.0).sum()
 
     if losses < 1e-10:
         return float("nan")  # No losses
@@ -414,96 +578,178 @@ def evaluate_fold(
     if n_bars == 0:
         return {"error": "no_data"}
 
-    # Primary (Tier 1)
-    weekly_sharpe = compute_weekly_sharpe(pnl, timestamps, days_per_week)
-    hit_rate = compute_hit_rate(predictions, actuals)
-    cumulative_pnl = compute_cumulative_pnl(pnl)
+    with _shared_daily_pnl(pnl, timestamps) as daily_pnl:
+        # Primary (Tier 1)
+        weekly_sharpe = compute_weekly_sharpe(pnl, timestamps, days_per_week)
+        hit_rate = compute_hit_rate(predictions, actuals)
+        cumulative_pnl = compute_cumulative_pnl(pnl)
 
-    # Secondary/Risk (Tier 2)
-    max_drawdown = compute_max_drawdown(pnl)
-    profit_factor = compute_profit_factor(pnl, timestamps)
-    bar_sharpe = float(np.mean(pnl) / np.std(pnl)) if np.std(pnl) > 0 else 0.0
-    return_per_bar = compute_return_per_bar(pnl)
+        # Secondary/Risk (Tier 2)
+        max_drawdown = compute_max_drawdown(pnl)
+        profit_factor = compute_profit_factor(pnl, timestamps)
+        pnl_std = np.std(pnl)
+        bar_sharpe = float(np.mean(pnl) / pnl_std) if pnl_std > 0 else 0.0
+        return_per_bar = compute_return_per_bar(pnl)
 
-    # ML Quality (Tier 3)
-    ic = compute_ic(predictions, actuals)
-    autocorr = compute_prediction_autocorr(predictions)
-    collapse_info = detect_model_collapse(predictions)
+        # ML Quality (Tier 3)
+        ic = compute_ic(predictions, actuals)
+        autocorr = compute_prediction_autocorr(predictions)
+        collapse_info = detect_model_collapse(predictions)
 
-    # Statistical validation (Tier 4)
-    daily_pnl = _group_by_day(pnl, timestamps)
-    n_days = len(daily_pnl)
-    skewness = float(stats.skew(daily_pnl)) if n_days > 2 else 0.0
-    kurtosis = float(stats.kurtosis(daily_pnl) + 3) if n_days > 3 else 3.0
+        # Statistical validation (Tier 4)
+        n_days = len(daily_pnl)
+        skewness, kurtosis = 0.0, 3.0
+        if n_days > 2:
+            _, _, skewness, daily_kurtosis = _moments(daily_pnl)
+            if n_days > 3:
+                kurtosis = daily_kurtosis
+
+        sharpe_se = compute_sharpe_se(weekly_sharpe, n_days, skewness, kurtosis)
+        psr = compute_psr(weekly_sharpe, sharpe_se) if not np.isnan(sharpe_se) else None
+        dsr = compute_dsr(weekly_sharpe, sharpe_se, n_trials) if not np.isnan(sharpe_se) else None
+
+        result = {
+            # Primary (Tier 1)
+            "weekly_sharpe": weekly_sharpe,
+            "hit_rate": hit_rate,
+            "cumulative_pnl": cumulative_pnl,
+            "n_bars": n_bars,
+            # Secondary/Risk (Tier 2)
+            "max_drawdown": max_drawdown,
+            "bar_sharpe": bar_sharpe,
+            "return_per_bar": return_per_bar,
+            "profit_factor": float(min(profit_factor, 1e6)) if not np.isnan(profit_factor) else None,
+            # ML Quality (Tier 3)
+            "ic": ic if not np.isnan(ic) else None,
+            "prediction_autocorr": autocorr if not np.isnan(autocorr) else None,
+            "is_collapsed": collapse_info["is_collapsed"],
+            # Statistical validation (Tier 4)
+            "sharpe_se": sharpe_se if not np.isnan(sharpe_se) else None,
+            "psr": psr,
+            "dsr": dsr,
+            "skewness": skewness,
+            "kurtosis": kurtosis,
+            "n_days": n_days,
+        }
+
+        # Extended Risk (Tier 5 - Optional)
+        if include_extended:
+            var_95, cvar_95 = compute_var_cvar(pnl, timestamps, confidence=0.95)
+            omega = compute_omega(pnl, timestamps)
+            sortino = compute_sortino(pnl, timestamps, annualization=annualization)
+            ulcer = compute_ulcer_index(pnl, timestamps)
+            calmar = compute_calmar_ratio(pnl, timestamps, annualization=annualization)
+
+            result.update({
+                "var_95": var_95 if not np.isnan(var_95) else None,
+                "cvar_95": cvar_95 if not np.isnan(cvar_95) else None,
+                "omega_ratio": omega if not np.isnan(omega) else None,
+                "sortino_ratio": sortino if not np.isnan(sortino) else None,
+                "ulcer_index": ulcer if not np.isnan(ulcer) else None,
+                "calmar_ratio": calmar if not np.isnan(calmar) else None,
+            })
+
+    return result
 
-    sharpe_se = compute_sharpe_se(weekly_sharpe, n_days, skewness, kurtosis)
-    psr = compute_psr(weekly_sharpe, sharpe_se) if not np.isnan(sharpe_se) else None
-    dsr = compute_dsr(weekly_sharpe, sharpe_se, n_trials) if not np.isnan(sharpe_se) else None
 
-    result = {
-        # Primary (Tier 1)
-        "weekly_sharpe": weekly_sharpe,
-        "hit_rate": hit_rate,
-        "cumulative_pnl": cumulative_pnl,
-        "n_bars": n_bars,
-        # Secondary/Risk (Tier 2)
-        "max_drawdown": max_drawdown,
-        "bar_sharpe": bar_sharpe,
-        "return_per_bar": return_per_bar,
-        "profit_factor": float(min(profit_factor, 1e6)) if not np.isnan(profit_factor) else None,
-        # ML Quality (Tier 3)
-        "ic": ic if not np.isnan(ic) else None,
-        "prediction_autocorr": autocorr if not np.isnan(autocorr) else None,
-        "is_collapsed": collapse_info["is_collapsed"],
-        # Statistical validation (Tier 4)
-        "sharpe_se": sharpe_se if not np.isnan(sharpe_se) else None,
-        "psr": psr,
-        "dsr": dsr,
-        "skewness": skewness,
-        "kurtosis": kurtosis,
-        "n_days": n_days,
-    }
+# Per-fold metrics that feed the cross-fold aggregates.
+_AGGREGATED_FIELDS = ("weekly_sharpe", "cumulative_pnl", "hit_rate", "ic")
 
-    # Extended Risk (Tier 5 - Optional)
-    if include_extended:
-        var_95, cvar_95 = compute_var_cvar(pnl, timestamps, confidence=0.95)
-        omega = compute_omega(pnl, timestamps)
-        sortino = compute_sortino(pnl, timestamps, annualization=annualization)
-        ulcer = compute_ulcer_index(pnl, timestamps)
-        calmar = compute_calmar_ratio(pnl, timestamps, annualization=annualization)
-
-        result.update({
-            "var_95": var_95 if not np.isnan(var_95) else None,
-            "cvar_95": cvar_95 if not np.isnan(cvar_95) else None,
-            "omega_ratio": omega if not np.isnan(omega) else None,
-            "sortino_ratio": sortino if not np.isnan(sortino) else None,
-            "ulcer_index": ulcer if not np.isnan(ulcer) else None,
-            "calmar_ratio": calmar if not np.isnan(calmar) else None,
-        })
+# FoldMetricsBuffer column layout. A None metric (not computed) is tracked
+# in its has_* flag instead of being folded into NaN, so a genuinely NaN
+# metric still counts as a fold and propagates into the aggregates.
+_FOLD_DTYPE = np.dtype(
+    [(name, "f8") for name in _AGGREGATED_FIELDS]
+    + [(f"has_{name}", "?") for name in _AGGREGATED_FIELDS]
+    + [("is_collapsed", "?")]
+)
 
-    return result
+
+class FoldMetricsBuffer:
+    """Structure-of-arrays accumulator for the aggregated per-fold metrics.
+
+    Keeps one preallocated contiguous array per metric plus its presence
+    flag (see ``_FOLD_DTYPE``), doubling capacity as needed. Drivers that
+    evaluate many folds ``append`` each result and pass the buffer to
+    ``compute_aggregate_metrics`` instead of keeping a list of dicts.
+    """
+
+    def __init__(self, capacity: int = 64) -> None:
+        capacity = max(capacity, 1)
+        self._n = 0
+        self._columns = {
+            name: np.zeros(capacity, dtype=_FOLD_DTYPE[name]) for name in _FOLD_DTYPE.names
+        }
+
+    def __len__(self) -> int:
+        return self._n
+
+    def append(self, metrics: dict) -> None:
+        """Add one fold's metrics (as returned by evaluate_fold)."""
+        i = self._n
+        if i == len(self._columns["weekly_sharpe"]):
+            for name, column in self._columns.items():
+                grown = np.zeros(2 * len(column), dtype=column.dtype)
+                grown[:i] = column
+                self._columns[name] = grown
+        for name in _AGGREGATED_FIELDS:
+            value = metrics.get(name)
+            self._columns[name][i] = np.nan if value is None else value
+            self._columns[f"has_{name}"][i] = value is not None
+        self._columns["is_collapsed"][i] = bool(metrics.get("is_collapsed", False))
+        self._n += 1
+
+    def columns(self) -> dict[str, np.ndarray]:
+        """Present values per aggregated metric, in fold order."""
+        n = self._n
+        columns = {
+            name: self._columns[name][:n][self._columns[f"has_{name}"][:n]]
+            for name in _AGGREGATED_FIELDS
+        }
+        columns["is_collapsed"] = self._columns["is_collapsed"][:n]
+        return columns
+
+
+def _fold_columns(fold_metrics: list[dict] | FoldMetricsBuffer) -> dict[str, np.ndarray]:
+    """Present values per aggregated metric (None skipped), in fold order.
+
+    A list of fold dicts is gathered with one comprehension per field.
+    """
+    if isinstance(fold_metrics, FoldMetricsBuffer):
+        return fold_metrics.columns()
+    columns = {
+        name: np.asarray(
+            [v for f in fold_metrics if (v := f.get(name)) is not None], dtype=float
+        )
+        for name in _AGGREGATED_FIELDS
+    }
+    columns["is_collapsed"] = np.asarray(
+        [bool(f.get("is_collapsed", False)) for f in fold_metrics], dtype=bool
+    )
+    return columns
 
 
-def compute_aggregate_metrics(fold_metrics: list[dict]) -> dict:
+def compute_aggregate_metrics(fold_metrics: list[dict] | FoldMetricsBuffer) -> dict:
     """Aggregate metrics across folds.
 
     Computes cross-fold statistics including cv_fold_returns for stability analysis.
+    Accepts a list of per-fold dicts or a ``FoldMetricsBuffer``, in fold order.
     """
-    sharpes = [f["weekly_sharpe"] for f in fold_metrics if f.get("weekly_sharpe") is not None]
-    returns = [f["cumulative_pnl"] for f in fold_metrics if f.get("cumulative_pnl") is not None]
+    folds = _fold_columns(fold_metrics)
+    sharpes = folds["weekly_sharpe"]
+    returns = folds["cumulative_pnl"]
 
-    if not sharpes:
+    if len(sharpes) == 0:
         return {"error": "no_valid_folds"}
 
-    positive_rate = np.mean([s > 0 for s in sharpes])
-
     # Binomial test
-    n_positive = sum(1 for s in sharpes if s > 0)
+    n_positive = int(np.count_nonzero(sharpes > 0))
     n_total = len(sharpes)
+    positive_rate = n_positive / n_total
     binomial_pvalue = float(1 - stats.binom.cdf(n_positive - 1, n_total, 0.5))
 
     # Autocorrelation of fold Sharpes
-    autocorr_lag1 = float(np.corrcoef(sharpes[:-1], sharpes[1:])[0, 1]) if len(sharpes) > 2 else 0.0
+    autocorr_lag1 = _pearson(sharpes[:-1], sharpes[1:]) if len(sharpes) > 2 else 0.0
     if np.isnan(autocorr_lag1):
         autocorr_lag1 = 0.0
 
@@ -513,16 +759,17 @@ def compute_aggregate_metrics(fold_metrics: list[dict]) -> dict:
 
     # CV of fold returns (coefficient of variation)
     # Lower is better: < 1.5 is acceptable, < 1.0 is good
-    mean_return = np.mean(returns) if returns else 0.0
-    std_return = np.std(returns) if returns else 0.0
+    has_returns = len(returns) > 0
+    mean_return = np.mean(returns) if has_returns else 0.0
+    std_return = np.std(returns) if has_returns else 0.0
     cv_fold_returns = float(std_return / abs(mean_return)) if abs(mean_return) > 1e-10 else float("nan")
 
     # Hit rates and ICs
-    hit_rates = [f["hit_rate"] for f in fold_metrics if f.get("hit_rate") is not None]
-    ics = [f["ic"] for f in fold_metrics if f.get("ic") is not None]
+    hit_rates = folds["hit_rate"]
+    ics = folds["ic"]
 
     # Collapse detection across folds
-    collapse_count = sum(1 for f in fold_metrics if f.get("is_collapsed", False))
+    collapse_count = int(np.count_nonzero(folds["is_collapsed"]))
 
     return {
         # Primary aggregates
@@ -532,10 +779,10 @@ def compute_aggregate_metrics(fold_metrics: list[dict]) -> dict:
         "positive_sharpe_rate": float(positive_rate),
         "n_folds": n_total,
         # Secondary aggregates
-        "total_cumulative_pnl": float(sum(returns)) if returns else 0.0,
+        "total_cumulative_pnl": float(np.sum(returns)) if has_returns else 0.0,
         "cv_fold_returns": cv_fold_returns if not np.isnan(cv_fold_returns) else None,
-        "mean_hit_rate": float(np.mean(hit_rates)) if hit_rates else None,
-        "mean_ic": float(np.mean(ics)) if ics else None,
+        "mean_hit_rate": float(np.mean(hit_rates)) if len(hit_rates) else None,
+        "mean_ic": float(np.mean(ics)) if len(ics) else None,
         # Diagnostic
         "binomial_pvalue": binomial_pvalue,
         "autocorr_lag1": autocorr_lag1,
@@ -551,6 +798,69 @@ def compute_aggregate_metrics(fold_metrics: list[dict]) -> dict:
 # =============================================================================
 
 
+FOLD_FILES = ("predictions.npy", "actuals.npy", "timestamps.npy")
+
+
+def _evaluate_fold_dir(fold_dir: Path, mmap_mode: str | None, settings: tuple) -> dict:
+    """Load and evaluate one fold directory (process-pool worker)."""
+    predictions, actuals, timestamps = (
+        np.load(fold_dir / name, mmap_mode=mmap_mode) for name in FOLD_FILES
+    )
+    return evaluate_fold(predictions, actuals, timestamps, *settings)
+
+
+def iter_fold_dirs(
+    fold_dirs: list[Path],
+    jobs: int = 1,
+    mmap: bool = False,
+    n_trials: int = 1,
+    days_per_week: int = 7,
+    include_extended: bool = True,
+    annualization: int = 365,
+) -> Iterator[dict]:
+    """Evaluate walk-forward folds stored one per directory, yielding results.
+
+    Each directory holds ``predictions.npy``, ``actuals.npy`` and
+    ``timestamps.npy``. Folds are independent, so with ``jobs > 1`` they are
+    spread over a process pool; results keep the input order (fold order
+    matters for the cross-fold Sharpe autocorrelation).
+    """
+    mmap_mode = "r" if mmap else None
+    settings = (n_trials, days_per_week, include_extended, annualization)
+    if jobs <= 1 or len(fold_dirs) <= 1:
+        for fold_dir in fold_dirs:
+            yield _evaluate_fold_dir(fold_dir, mmap_mode, settings)
+        return
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(fold_dirs))) as executor:
+        yield from executor.map(
+            _evaluate_fold_dir,
+            fold_dirs,
+            itertools.repeat(mmap_mode),
+            itertools.repeat(settings),
+        )
+
+
+def _loads(line: bytes) -> dict:
+    """Parse one JSON line, using orjson when available.
+
+    orjson rejects the NaN/Infinity literals that ``json.dumps`` emits, so
+    such lines fall back to the stdlib parser.
+    """
+    if not _HAS_ORJSON:
+        return json.loads(line)
+    try:
+        return orjson.loads(line)
+    except orjson.JSONDecodeError:
+        return json.loads(line)
+
+
+def _load_jsonl(path: Path) -> list[dict]:
+    """Read one JSON object per line, skipping blank lines."""
+    with open(path, "rb") as f:
+        return [_loads(line) for line in f if line.strip()]
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Compute range bar evaluation metrics",
@@ -567,6 +877,13 @@ Examples:
   # Aggregate across folds
   python compute_metrics.py --results folds.jsonl --aggregate
 
+  # Evaluate walk-forward folds (one directory each with predictions.npy,
+  # actuals.npy, timestamps.npy) on 8 processes, then aggregate
+  python compute_metrics.py --fold-dirs folds/fold_* --jobs 8 --aggregate
+
+  # Memory-map multi-GB .npy inputs instead of reading them up front
+  python compute_metrics.py --predictions preds.npy --actuals actuals.npy --timestamps ts.npy --mmap
+
   # Skip extended risk metrics for faster computation
   python compute_metrics.py --predictions preds.npy --actuals actuals.npy --timestamps ts.npy \\
       --no-extended
@@ -578,7 +895,19 @@ Reference: quant-research:rangebar-eval-metrics skill
     parser.add_argument("--actuals", type=Path, help="Path to actuals .npy")
     parser.add_argument("--timestamps", type=Path, help="Path to timestamps .npy")
     parser.add_argument("--results", type=Path, help="Path to fold results .jsonl")
+    parser.add_argument(
+        "--fold-dirs",
+        type=Path,
+        nargs="+",
+        help="Fold directories, each with predictions.npy, actuals.npy, timestamps.npy",
+    )
     parser.add_argument("--aggregate", action="store_true", help="Compute aggregate metrics")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for --fold-dirs evaluation",
+    )
     parser.add_argument("--output", type=Path, help="Output path (default: stdout)")
     parser.add_argument(
         "--days-per-week",
@@ -599,6 +928,11 @@ Reference: quant-research:rangebar-eval-metrics skill
         action="store_true",
         help="Skip extended risk metrics (VaR, Sortino, Omega, etc.)",
     )
+    parser.add_argument(
+        "--mmap",
+        action="store_true",
+        help="Memory-map .npy inputs (read-only) instead of loading them into RAM",
+    )
     parser.add_argument(
         "--n-trials",
         type=int,
@@ -610,16 +944,36 @@ Reference: quant-research:rangebar-eval-metrics skill
 
     if args.results and args.aggregate:
         # Aggregate mode
-        fold_metrics = []
-        with open(args.results) as f:
-            for line in f:
-                fold_metrics.append(json.loads(line))
+        fold_metrics = _load_jsonl(args.results)
         result = compute_aggregate_metrics(fold_metrics)
+    elif args.fold_dirs:
+        # Multi-fold mode: one JSON line per fold, or their aggregate
+        folds = iter_fold_dirs(
+            args.fold_dirs,
+            jobs=args.jobs,
+            mmap=args.mmap,
+            n_trials=args.n_trials,
+            days_per_week=args.days_per_week,
+            include_extended=not args.no_extended,
+            annualization=args.annualization,
+        )
+        if not args.aggregate:
+            output = "\n".join(json.dumps(f) for f in folds)
+            if args.output:
+                args.output.write_text(output + "\n")
+            else:
+                print(output)
+            return
+        buffer = FoldMetricsBuffer(capacity=len(args.fold_dirs))
+        for fold in folds:
+            buffer.append(fold)
+        result = compute_aggregate_metrics(buffer)
     elif args.predictions and args.actuals and args.timestamps:
         # Single fold mode
-        predictions = np.load(args.predictions)
-        actuals = np.load(args.actuals)
-        timestamps = np.load(args.timestamps)
+        mmap_mode = "r" if args.mmap else None
+        predictions = np.load(args.predictions, mmap_mode=mmap_mode)
+        actuals = np.load(args.actuals, mmap_mode=mmap_mode)
+        timestamps = np.load(args.timestamps, mmap_mode=mmap_mode)
         result = evaluate_fold(
             predictions,
             actuals,
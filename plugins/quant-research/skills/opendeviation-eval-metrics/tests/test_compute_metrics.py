@@ -0,0 +1,317 @@
+"""Regression tests for compute_metrics.py.
+
+Oracles are the straightforward NumPy / pandas formulations the optimized
+kernels replaced, so behaviour on edge cases (NaN, ties, unsorted bars)
+stays pinned.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import compute_metrics as cm  # noqa: E402
+
+
+# =============================================================================
+# compute_hit_rate
+# =============================================================================
+
+
+def _reference_hit_rate(predictions, actuals):
+    return float(np.mean(np.sign(predictions) == np.sign(actuals)))
+
+
+def test_hit_rate_nan_never_agrees():
+    predictions = np.array([np.nan, 1.0, -1.0, np.nan])
+    actuals = np.array([1.0, np.nan, np.nan, np.nan])
+    assert cm.compute_hit_rate(predictions, actuals) == 0.0
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_hit_rate_matches_sign_equality(dtype):
+    rng = np.random.default_rng(0)
+    predictions = rng.normal(size=500)
+    actuals = rng.normal(size=500)
+    predictions[rng.integers(0, 500, 40)] = np.nan
+    predictions[rng.integers(0, 500, 20)] = -0.0
+    actuals[rng.integers(0, 500, 40)] = 0.0
+    actuals[rng.integers(0, 500, 10)] = np.inf
+    predictions, actuals = predictions.astype(dtype), actuals.astype(dtype)
+
+    assert cm.compute_hit_rate(predictions, actuals) == _reference_hit_rate(predictions, actuals)
+
+
+def test_hit_rate_mixed_and_integer_inputs():
+    predictions = np.array([1, -2, 0, 3])
+    actuals = np.array([0.5, 2.0, 0.0, -1.0], dtype=np.float32)
+    assert cm.compute_hit_rate(predictions, actuals) == _reference_hit_rate(predictions, actuals)
+
+
+# =============================================================================
+# compute_var_cvar
+# =============================================================================
+
+
+def _daily(values):
+    """One bar per day, so daily PnL equals the input values."""
+    values = np.asarray(values, dtype=np.float64)
+    timestamps = np.datetime64("2024-01-01", "ns") + np.arange(len(values)) * np.timedelta64(1, "D")
+    return values, timestamps
+
+
+def _reference_var_cvar(values, confidence):
+    var = float(np.percentile(values, 100 * (1 - confidence)))
+    return var, float(np.mean(values[values <= var]))
+
+
+@pytest.mark.parametrize("confidence", [0.95, 0.9, 0.99, 0.5])
+@pytest.mark.parametrize("n", [5, 37, 250])
+def test_var_cvar_matches_percentile_without_ties(n, confidence):
+    values, timestamps = _daily(np.random.default_rng(n).normal(size=n))
+    var, cvar = cm.compute_var_cvar(values, timestamps, confidence)
+    ref_var, ref_cvar = _reference_var_cvar(values, confidence)
+    assert var == pytest.approx(ref_var, rel=1e-12)
+    assert cvar == pytest.approx(ref_cvar, rel=1e-12)
+
+
+def test_var_cvar_includes_all_days_tied_at_var():
+    # 5% of 21 days lands exactly on the 2nd smallest value (h = 1.0);
+    # every day tied at that level belongs to the tail.
+    values = np.r_[-5.0, -2.0, -2.0, -2.0, np.arange(1.0, 18.0)]
+    rng = np.random.default_rng(0)
+    values, timestamps = _daily(rng.permutation(values))
+    var, cvar = cm.compute_var_cvar(values, timestamps, 0.95)
+    assert var == -2.0
+    assert cvar == pytest.approx((-5.0 - 2.0 * 3) / 4)
+
+
+def test_var_cvar_quantile_exactly_on_a_sample():
+    # n=101 at 95%: h = 100 * 0.05 = 5, i.e. the 6th smallest day, even
+    # though 1 - 0.95 is not exactly 0.05 in floating point.
+    values, timestamps = _daily(np.random.default_rng(1).permutation(np.arange(101.0)))
+    var, cvar = cm.compute_var_cvar(values, timestamps, 0.95)
+    assert var == 5.0
+    assert cvar == pytest.approx(np.mean(np.arange(6.0)))
+
+
+def test_var_cvar_min_days():
+    values, timestamps = _daily([3.0, -1.0, 2.0, -4.0, 0.5])
+    var, cvar = cm.compute_var_cvar(values, timestamps, 0.95)
+    # h = 4 * 0.05 = 0.2 between the two smallest days (-4, -1)
+    assert var == pytest.approx(-4.0 + 0.2 * 3.0)
+    assert cvar == -4.0
+
+    short, short_ts = _daily([3.0, -1.0, 2.0, -4.0])
+    assert all(np.isnan(x) for x in cm.compute_var_cvar(short, short_ts, 0.95))
+
+
+# =============================================================================
+# compute_aggregate_metrics
+# =============================================================================
+
+
+def _fold(sharpe, pnl=1.0, hit=0.5, ic=0.1, collapsed=False):
+    return {
+        "weekly_sharpe": sharpe,
+        "cumulative_pnl": pnl,
+        "hit_rate": hit,
+        "ic": ic,
+        "is_collapsed": collapsed,
+    }
+
+
+def _assert_same_metrics(result, expected):
+    assert result.keys() == expected.keys()
+    for key, value in expected.items():
+        if isinstance(value, float) and np.isnan(value):
+            assert np.isnan(result[key])
+        else:
+            assert result[key] == value
+
+
+def test_aggregate_keeps_nan_folds_but_skips_none():
+    nan_fold = [_fold(1.0), _fold(float("nan")), _fold(-0.5), _fold(2.0)]
+    result = cm.compute_aggregate_metrics(nan_fold)
+    assert result["n_folds"] == 4
+    assert result["positive_sharpe_rate"] == 0.5
+    assert np.isnan(result["mean_weekly_sharpe"])
+
+    none_fold = [_fold(1.0), _fold(None), _fold(-0.5), _fold(2.0)]
+    result = cm.compute_aggregate_metrics(none_fold)
+    assert result["n_folds"] == 3
+    assert result["positive_sharpe_rate"] == pytest.approx(2 / 3)
+    assert result["mean_weekly_sharpe"] == pytest.approx(2.5 / 3)
+
+
+def test_aggregate_optional_metrics():
+    folds = [_fold(1.0, ic=None, collapsed=True), _fold(0.5, ic=0.3, pnl=None)]
+    result = cm.compute_aggregate_metrics(folds)
+    assert result["mean_ic"] == pytest.approx(0.3)
+    assert result["total_cumulative_pnl"] == pytest.approx(1.0)
+    assert result["collapse_count"] == 1
+    assert cm.compute_aggregate_metrics([_fold(None)]) == {"error": "no_valid_folds"}
+    assert cm.compute_aggregate_metrics([]) == {"error": "no_valid_folds"}
+
+
+# =============================================================================
+# Daily aggregation reuse
+# =============================================================================
+
+
+def test_group_by_day_sees_in_place_mutation():
+    timestamps = np.array(
+        ["2024-01-01T01", "2024-01-01T02", "2024-01-01T03"], dtype="datetime64[ns]"
+    )
+    pnl = np.array([1.0, 2.0, 3.0])
+    assert cm._group_by_day(pnl, timestamps).tolist() == [6.0]
+    pnl[0] = 100.0
+    assert cm._group_by_day(pnl, timestamps).tolist() == [105.0]
+
+
+def test_shared_daily_pnl_is_scoped_to_the_block():
+    timestamps = np.array(["2024-01-01", "2024-01-02"], dtype="datetime64[ns]")
+    pnl = np.array([1.0, 2.0])
+    with cm._shared_daily_pnl(pnl, timestamps) as daily_pnl:
+        assert cm._group_by_day(pnl, timestamps) is daily_pnl
+        assert cm._group_by_day(pnl.copy(), timestamps) is not daily_pnl
+    assert cm._group_by_day(pnl, timestamps) is not daily_pnl
+
+
+def _pandas_group_by_day(pnl, timestamps):
+    """The pre-NumPy implementation of _group_by_day."""
+    pd = pytest.importorskip("pandas")
+    df = pd.DataFrame({"pnl": pnl, "ts": pd.to_datetime(timestamps, utc=True)})
+    df["date"] = df["ts"].dt.date
+    return df.groupby("date")["pnl"].sum().values
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+@pytest.mark.parametrize("encoding", ["datetime64[ns]", "datetime64[ms]", "epoch_ns"])
+def test_group_by_day_matches_pandas(ordered, encoding):
+    rng = np.random.default_rng(7)
+    epoch_ns = rng.integers(1_600_000_000 * 10**9, 1_600_000_000 * 10**9 + 40 * 86_400 * 10**9, 400)
+    if ordered:
+        epoch_ns = np.sort(epoch_ns)
+    pnl = rng.normal(size=400)
+    pnl[:20] = np.nan  # model warm-up
+    pnl[rng.integers(0, 400, 15)] = np.nan
+
+    if encoding == "epoch_ns":
+        timestamps = epoch_ns
+    else:
+        timestamps = epoch_ns.astype("datetime64[ns]").astype(encoding)
+
+    np.testing.assert_allclose(
+        cm._group_by_day(pnl, timestamps), _pandas_group_by_day(pnl, timestamps), rtol=1e-12
+    )
+
+
+def test_group_by_day_nan_inf_and_nat():
+    timestamps = np.array(
+        ["2024-01-01T01", "2024-01-01T02", "NaT", "2024-01-02T05", "2024-01-03"],
+        dtype="datetime64[ns]",
+    )
+    pnl = np.array([1.0, np.nan, 7.0, np.nan, np.inf])
+    np.testing.assert_array_equal(cm._group_by_day(pnl, timestamps), [1.0, 0.0, np.inf])
+    np.testing.assert_array_equal(
+        cm._group_by_day(pnl, timestamps), _pandas_group_by_day(pnl, timestamps)
+    )
+
+
+def test_evaluate_fold_tolerates_warmup_nans():
+    rng = np.random.default_rng(3)
+    n = 500
+    predictions = rng.normal(size=n)
+    predictions[:20] = np.nan
+    actuals = rng.normal(size=n)
+    timestamps = (
+        np.datetime64("2024-01-01", "ns") + np.arange(n) * np.timedelta64(2, "h")
+    )
+
+    result = cm.evaluate_fold(predictions, actuals, timestamps)
+    assert np.isfinite(result["weekly_sharpe"])
+    for key in ("sharpe_se", "psr", "dsr", "profit_factor", "omega_ratio", "sortino_ratio"):
+        assert result[key] is not None
+
+
+def test_fold_metrics_buffer_matches_list_of_dicts():
+    rng = np.random.default_rng(11)
+    folds = [
+        _fold(s, pnl=p, collapsed=bool(i % 7 == 0))
+        for i, (s, p) in enumerate(zip(rng.normal(size=50), rng.normal(size=50)))
+    ]
+    folds[3] = _fold(None, ic=None)
+    folds[8] = _fold(float("nan"), hit=None)
+
+    buffer = cm.FoldMetricsBuffer(capacity=4)  # forces several regrowths
+    for fold in folds:
+        buffer.append(fold)
+
+    assert len(buffer) == len(folds)
+    from_buffer = cm.compute_aggregate_metrics(buffer)
+    from_list = cm.compute_aggregate_metrics(folds)
+    _assert_same_metrics(from_buffer, from_list)
+
+
+def test_empty_fold_metrics_buffer():
+    assert cm.compute_aggregate_metrics(cm.FoldMetricsBuffer()) == {"error": "no_valid_folds"}
+
+
+def test_load_jsonl_nan_lines_match_stdlib(tmp_path):
+    folds = [_fold(1.0), _fold(float("nan")), _fold(-0.5, ic=None), _fold(2.0, collapsed=True)]
+    path = tmp_path / "results.jsonl"
+    path.write_text("".join(json.dumps(f) + "\n" for f in folds) + "\n")
+
+    loaded = cm._load_jsonl(path)
+    stdlib = [json.loads(line) for line in path.read_text().splitlines() if line.strip()]
+    assert len(loaded) == len(folds)
+
+    _assert_same_metrics(
+        cm.compute_aggregate_metrics(loaded), cm.compute_aggregate_metrics(stdlib)
+    )
+
+
+# =============================================================================
+# Fold directories
+# =============================================================================
+
+
+@pytest.fixture
+def fold_dirs(tmp_path):
+    rng = np.random.default_rng(5)
+    dirs = []
+    for i, n in enumerate([300, 450, 200]):
+        fold_dir = tmp_path / f"fold_{i}"
+        fold_dir.mkdir()
+        start = np.datetime64("2024-01-01", "ns") + i * n * np.timedelta64(2, "h")
+        np.save(fold_dir / "predictions.npy", rng.normal(size=n))
+        np.save(fold_dir / "actuals.npy", rng.normal(size=n) * 0.01)
+        np.save(fold_dir / "timestamps.npy", start + np.arange(n) * np.timedelta64(2, "h"))
+        dirs.append(fold_dir)
+    return dirs
+
+
+def test_iter_fold_dirs_parallel_matches_serial_in_order(fold_dirs):
+    serial = list(cm.iter_fold_dirs(fold_dirs, jobs=1))
+    parallel = list(cm.iter_fold_dirs(fold_dirs, jobs=2))
+
+    assert [f["n_bars"] for f in serial] == [300, 450, 200]
+    assert len(parallel) == len(serial)
+    for result, expected in zip(parallel, serial):
+        _assert_same_metrics(result, expected)
+
+
+def test_cli_fold_dirs_aggregate(fold_dirs, tmp_path, monkeypatch):
+    output = tmp_path / "aggregate.json"
+    argv = ["compute_metrics.py", "--fold-dirs", *map(str, fold_dirs)]
+    argv += ["--aggregate", "--jobs", "2", "--output", str(output)]
+    monkeypatch.setattr(sys, "argv", argv)
+    cm.main()
+
+    folds = [cm.evaluate_fold(*(np.load(d / name) for name in cm.FOLD_FILES)) for d in fold_dirs]
+    _assert_same_metrics(json.loads(output.read_text()), cm.compute_aggregate_metrics(folds))